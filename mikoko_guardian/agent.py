@@ -1,13 +1,17 @@
-import datetime
-import json
-import os
-from typing import Dict, List, Optional
-from zoneinfo import ZoneInfo
+import functools
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Optional
+import numpy as np
 from google.adk.agents import Agent
-from google.generativeai import GenerativeModel
 from google.genai import types
-import vertexai
-from vertexai.preview import reasoning_engines
+
+if TYPE_CHECKING:
+    from google.generativeai import GenerativeModel
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Constants for Kenya's coastal mangrove species
 KENYA_MANGROVE_SPECIES = {
@@ -76,8 +80,223 @@ KENYA_COASTAL_REGIONS = {
         "threats": ["Urban expansion", "Pollution", "Port activities"]
     }
 }
+
+# Read-only views so no tool can mutate the tables behind the cached lookups
+KENYA_MANGROVE_SPECIES = MappingProxyType(
+    {name: MappingProxyType(info) for name, info in KENYA_MANGROVE_SPECIES.items()}
+)
+KENYA_COASTAL_REGIONS = MappingProxyType(
+    {name: MappingProxyType(info) for name, info in KENYA_COASTAL_REGIONS.items()}
+)
+
+# Lookup indexes built once from the constant tables above
+_TRIE_END = None    # Node key holding the canonical key of an alias ending here
+_TRIE_FIRST = ""    # Node key holding the first canonical key below this node
+
+def _build_trie(aliases: Dict[str, str]) -> dict:
+    """
+    Builds a nested-dict character trie over alias strings.
+    
+    Args:
+        aliases (dict): Lowercase alias mapped to its canonical table key.
+        
+    Returns:
+        dict: Root node of the trie.
+    """
+    root = {_TRIE_FIRST: next(iter(aliases.values()))}
+    for alias, canonical in aliases.items():
+        node = root
+        for char in alias:
+            node = node.setdefault(char, {_TRIE_FIRST: canonical})
+        node.setdefault(_TRIE_END, canonical)
+    return root
+
+def _trie_lookup(trie: dict, query: str) -> Optional[str]:
+    """
+    Resolves a query against a trie by prefix.
+    
+    Args:
+        trie (dict): Root node built by _build_trie.
+        query (str): Lowercase query string.
+        
+    Returns:
+        str: Canonical key of the first alias the query is a prefix of, else the
+            longest alias that prefixes the query as a whole word, else None.
+    """
+    node = trie
+    longest = None
+    for char in query:
+        if _TRIE_END in node and not char.isalnum():
+            longest = node[_TRIE_END]
+        node = node.get(char)
+        if node is None:
+            return longest
+    return node[_TRIE_FIRST]
+
+def _build_aliases(table: MappingProxyType, extra_field: str) -> Dict[str, str]:
+    """
+    Maps every lowercase alias of a table entry to its canonical key.
+    
+    Args:
+        table (mapping): KENYA_MANGROVE_SPECIES or KENYA_COASTAL_REGIONS.
+        extra_field (str): Entry field that is also accepted as a name.
+        
+    Returns:
+        dict: The full key, each word of it, and the extra field, mapped to the key.
+    """
+    aliases = {}
+    for name, info in table.items():
+        for alias in (name, *name.split(), info[extra_field].lower()):
+            aliases.setdefault(alias, name)
+    return aliases
+
+def _build_entity_patterns() -> Dict[str, tuple]:
+    """
+    Maps the names to spot inside free text to (kind, canonical key).
+    
+    Returns:
+        dict: Species keys, Swahili names and site keys.
+    """
+    patterns = {}
+    for name, info in KENYA_MANGROVE_SPECIES.items():
+        patterns.setdefault(name, ("species", name))
+        patterns.setdefault(info["swahili_name"].lower(), ("species", name))
+    for name in KENYA_COASTAL_REGIONS:
+        patterns.setdefault(name, ("site", name))
+    return patterns
+
+def _build_automaton(patterns: Dict[str, tuple]):
+    """
+    Builds an Aho-Corasick automaton over the patterns, or None without pyahocorasick.
+    
+    Args:
+        patterns (dict): Pattern mapped to (kind, canonical key).
+        
+    Returns:
+        ahocorasick.Automaton: Yields (length, kind, canonical key) per hit.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern, (kind, name) in patterns.items():
+        automaton.add_word(pattern, (len(pattern), kind, name))
+    automaton.make_automaton()
+    return automaton
+
+_SPECIES_ALIAS = _build_aliases(KENYA_MANGROVE_SPECIES, "swahili_name")
+_REGION_ALIAS = _build_aliases(KENYA_COASTAL_REGIONS, "county")
+
+_SPECIES_TRIE = _build_trie(_SPECIES_ALIAS)
+_REGION_TRIE = _build_trie(_REGION_ALIAS)
+
+_ENTITY_PATTERNS = _build_entity_patterns()
+_AC = _build_automaton(_ENTITY_PATTERNS)
+
+# Display forms of the canonical keys
+_SPECIES_TITLE = {name: name.title() for name in KENYA_MANGROVE_SPECIES}
+_REGION_TITLE = {name: name.title() for name in KENYA_COASTAL_REGIONS}
+_REGION_RECOMMENDED_SPECIES = {
+    name: tuple(_SPECIES_TITLE[species] for species in info["dominant_species"])
+    for name, info in KENYA_COASTAL_REGIONS.items()
+}
+
+class _FrozenDict(dict):
+    """
+    Read-only dict for prebuilt responses shared by every call.
+    
+    Still a real dict, so json.dumps and the ADK function-response layer accept it;
+    copy.copy, deepcopy and pickle produce a plain, mutable dict.
+    """
+    __slots__ = ()
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Prebuilt responses are read-only; copy them with dict() first.")
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def __reduce_ex__(self, protocol):
+        return dict, (dict(self),)
+
+# Dominant species joined against the species table
+_REGION_SPECIES_INFO = {
+    name: tuple(
+        _FrozenDict(
+            name=_SPECIES_TITLE[species],
+            swahili_name=KENYA_MANGROVE_SPECIES[species]["swahili_name"]
+        )
+        for species in info["dominant_species"]
+        if species in KENYA_MANGROVE_SPECIES
+    )
+    for name, info in KENYA_COASTAL_REGIONS.items()
+}
+
+# Complete success responses for every known species and site, returned as-is
+_SPECIES_SUCCESS = {
+    name: _FrozenDict(
+        status="success",
+        report=_FrozenDict(
+            species=_SPECIES_TITLE[name],
+            swahili_name=info["swahili_name"],
+            characteristics=info["characteristics"],
+            uses=info["uses"],
+            conservation_status=info["conservation_status"]
+        )
+    )
+    for name, info in KENYA_MANGROVE_SPECIES.items()
+}
+
+_REGION_SUCCESS = {
+    name: _FrozenDict(
+        status="success",
+        report=_FrozenDict(
+            location=_REGION_TITLE[name],
+            county=info["county"],
+            mangrove_area_hectares=info["mangrove_area_hectares"],
+            dominant_species=_REGION_SPECIES_INFO[name],
+            threats=tuple(info["threats"])
+        )
+    )
+    for name, info in KENYA_COASTAL_REGIONS.items()
+}
+
+_REGION_THREAT_SETS = {
+    name: frozenset(info["threats"]) for name, info in KENYA_COASTAL_REGIONS.items()
+}
+
 # Core Agent Functions
 
+@functools.lru_cache(maxsize=512)
+def _match_species(species_name_lower: str) -> Optional[str]:
+    """
+    Resolves a lowercase species query to its canonical species key.
+    
+    Args:
+        species_name_lower (str): Lowercased common or scientific name.
+        
+    Returns:
+        str: Key into KENYA_MANGROVE_SPECIES, or None if nothing matches.
+    """
+    # Check direct matches on scientific, genus, epithet and Swahili names
+    if species_name_lower in _SPECIES_ALIAS:
+        return _SPECIES_ALIAS[species_name_lower]
+    
+    # Check prefix matches
+    name = _trie_lookup(_SPECIES_TRIE, species_name_lower)
+    if name is not None:
+        return name
+    
+    # Check whole names mentioned anywhere in the query
+    name = next(
+        (name for kind, name in find_known_entities(species_name_lower) if kind == "species"),
+        None
+    )
+    if name is not None:
+        return name
+    
+    # Check fragments of a scientific name
+    return next((name for name in KENYA_MANGROVE_SPECIES if species_name_lower in name), None)
+
 def identify_mangrove_species(species_name: str) -> dict:
     """
     Identifies a mangrove species and provides information about it.
@@ -86,54 +305,54 @@ def identify_mangrove_species(species_name: str) -> dict:
         species_name (str): Common or scientific name of the mangrove species.
         
     Returns:
-        dict: Information about the species or error message.
+        dict: Information about the species or error message. Success responses
+            are shared and read-only.
     """
-    species_name_lower = species_name.lower()
-    
-    # Check direct matches
-    if species_name_lower in KENYA_MANGROVE_SPECIES:
-        info = KENYA_MANGROVE_SPECIES[species_name_lower]
-        return {
-            "status": "success",
-            "report": {
-                "species": species_name.title(),
-                "swahili_name": info["swahili_name"],
-                "characteristics": info["characteristics"],
-                "uses": info["uses"],
-                "conservation_status": info["conservation_status"]
-            }
-        }
+    # Canonical keys skip normalisation and matching entirely
+    if species_name in _SPECIES_SUCCESS:
+        name = species_name
+    else:
+        name = _match_species(species_name.lower())
     
-    # Check partial matches
-    for name, info in KENYA_MANGROVE_SPECIES.items():
-        if species_name_lower in name or name in species_name_lower:
-            return {
-                "status": "success",
-                "report": {
-                    "species": name.title(),
-                    "swahili_name": info["swahili_name"],
-                    "characteristics": info["characteristics"],
-                    "uses": info["uses"],
-                    "conservation_status": info["conservation_status"]
-                }
-            }
-        if info["swahili_name"].lower() == species_name_lower:
-            return {
-                "status": "success",
-                "report": {
-                    "species": name.title(),
-                    "swahili_name": info["swahili_name"],
-                    "characteristics": info["characteristics"],
-                    "uses": info["uses"],
-                    "conservation_status": info["conservation_status"]
-                }
-            }
+    if name is not None:
+        return _SPECIES_SUCCESS[name]
     
     return {
         "status": "error",
         "error_message": f"Could not identify mangrove species '{species_name}'. Please try using scientific name or Swahili name."
     }
 
+@functools.lru_cache(maxsize=512)
+def _match_site(location_lower: str) -> Optional[str]:
+    """
+    Resolves a lowercase location query to its canonical region key.
+    
+    Args:
+        location_lower (str): Lowercased name of the coastal area or county.
+        
+    Returns:
+        str: Key into KENYA_COASTAL_REGIONS, or None if nothing matches.
+    """
+    # Check direct matches on site, place-word and county names
+    if location_lower in _REGION_ALIAS:
+        return _REGION_ALIAS[location_lower]
+    
+    # Check prefix matches
+    name = _trie_lookup(_REGION_TRIE, location_lower)
+    if name is not None:
+        return name
+    
+    # Check whole names mentioned anywhere in the query
+    name = next(
+        (name for kind, name in find_known_entities(location_lower) if kind == "site"),
+        None
+    )
+    if name is not None:
+        return name
+    
+    # Check fragments of a site name
+    return next((name for name in KENYA_COASTAL_REGIONS if location_lower in name), None)
+
 def get_site_information(location: str) -> dict:
     """
     Provides information about mangrove forests in a specific coastal location.
@@ -142,63 +361,107 @@ def get_site_information(location: str) -> dict:
         location (str): Name of the coastal area in Kenya.
         
     Returns:
-        dict: Information about the mangrove site or error message.
+        dict: Information about the mangrove site or error message. Success
+            responses are shared and read-only.
     """
-    location_lower = location.lower()
+    # Canonical keys skip normalisation and matching entirely
+    if location in _REGION_SUCCESS:
+        name = location
+    else:
+        name = _match_site(location.lower())
     
-    # Check direct matches
-    if location_lower in KENYA_COASTAL_REGIONS:
-        info = KENYA_COASTAL_REGIONS[location_lower]
-        
-        # Get dominant species information
-        species_info = []
-        for species in info["dominant_species"]:
-            if species in KENYA_MANGROVE_SPECIES:
-                species_info.append({
-                    "name": species.title(),
-                    "swahili_name": KENYA_MANGROVE_SPECIES[species]["swahili_name"]
-                })
-        
-        return {
-            "status": "success",
-            "report": {
-                "location": location.title(),
-                "county": info["county"],
-                "mangrove_area_hectares": info["mangrove_area_hectares"],
-                "dominant_species": species_info,
-                "threats": info["threats"]
-            }
-        }
-    
-    # Check partial matches
-    for name, info in KENYA_COASTAL_REGIONS.items():
-        if location_lower in name or name in location_lower or info["county"].lower() == location_lower:
-            species_info = []
-            for species in info["dominant_species"]:
-                if species in KENYA_MANGROVE_SPECIES:
-                    species_info.append({
-                        "name": species.title(),
-                        "swahili_name": KENYA_MANGROVE_SPECIES[species]["swahili_name"]
-                    })
-            
-            return {
-                "status": "success",
-                "report": {
-                    "location": name.title(),
-                    "county": info["county"],
-                    "mangrove_area_hectares": info["mangrove_area_hectares"],
-                    "dominant_species": species_info,
-                    "threats": info["threats"]
-                }
-            }
+    if name is not None:
+        return _REGION_SUCCESS[name]
     
     return {
         "status": "error",
         "error_message": f"Information about mangroves in '{location}' is not available in our database."
     }
 
+def find_known_entities(text: str) -> List[tuple]:
+    """
+    Finds known species and site names mentioned anywhere in free text.
+    
+    Args:
+        text (str): User text, e.g. "how much carbon is stored at Mida Creek?".
+        
+    Returns:
+        list: (kind, canonical key) pairs in order of first mention, where kind
+            is "species" or "site".
+    """
+    text_lower = text.lower()
+    
+    # Collect (start, end, kind, name) for every occurrence
+    if _AC is not None:
+        hits = [
+            (end - length + 1, end + 1, kind, name)
+            for end, (length, kind, name) in _AC.iter(text_lower)
+        ]
+    else:
+        hits = []
+        for pattern, (kind, name) in _ENTITY_PATTERNS.items():
+            start = text_lower.find(pattern)
+            while start != -1:
+                hits.append((start, start + len(pattern), kind, name))
+                start = text_lower.find(pattern, start + 1)
+    hits.sort()
+    
+    # Keep whole-word mentions only, once each
+    entities = []
+    for start, end, kind, name in hits:
+        if start > 0 and text_lower[start - 1].isalnum():
+            continue
+        if end < len(text_lower) and text_lower[end].isalnum():
+            continue
+        if (kind, name) not in entities:
+            entities.append((kind, name))
+    return entities
+
 # Carborn Storage Calculator 
 
+# Carbon storage rates per hectare based on research in Kenya
+# These are simplified estimates for educational purposes
+_CARBON_RATES = {
+    "young": 143,       # Tons of carbon per hectare
+    "middle-aged": 297, # Tons of carbon per hectare
+    "mature": 392       # Tons of carbon per hectare
+}
+_CO2_PER_TON_CARBON = 3.67        # Convert carbon to CO2 equivalent
+_CARBON_CREDIT_USD_PER_TON = 15.0 # Assuming $15 per ton of CO2
+_CARBON_NOTE = "These are estimates based on general studies of Kenyan mangroves. Actual values may vary based on species composition, health, and local conditions."
+
+def _carbon_math(area: float, carbon_per_hectare: float) -> tuple:
+    """
+    Computes total carbon, CO2 equivalent and carbon credit value for an area.
+    
+    Args:
+        area (float or ndarray): Area of mangrove forest in hectares.
+        carbon_per_hectare (float or ndarray): Tons of carbon stored per hectare.
+        
+    Returns:
+        tuple: (total_carbon_tons, co2_equivalent_tons, carbon_credit_value_usd)
+    """
+    total_carbon = area * carbon_per_hectare
+    co2_equivalent = total_carbon * _CO2_PER_TON_CARBON
+    
+    # Economic value (using simplified carbon credit value)
+    carbon_credit_value_usd = co2_equivalent * _CARBON_CREDIT_USD_PER_TON
+    return total_carbon, co2_equivalent, carbon_credit_value_usd
+
+@functools.lru_cache(maxsize=None)
+def _get_carbon_batch_kernel():
+    """
+    Returns _carbon_math for whole arrays, compiled with Numba on first use if installed.
+    
+    Only the batch tool uses this: for a single area the jitted call costs more than
+    the plain Python arithmetic, and importing Numba would slow agent startup.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _carbon_math
+    return njit(cache=True)(_carbon_math)
+
 def calculate_carbon_storage(area: float, forest_age: str = "mature") -> dict:
     """
     Estimates carbon storage potential of a mangrove forest area.
@@ -217,24 +480,12 @@ def calculate_carbon_storage(area: float, forest_age: str = "mature") -> dict:
             "error_message": "Please provide a valid positive number for area in hectares."
         }
     
-    # Carbon storage rates per hectare based on research in Kenya
-    # These are simplified estimates for educational purposes
-    carbon_rates = {
-        "young": 143,       # Tons of carbon per hectare
-        "middle-aged": 297, # Tons of carbon per hectare
-        "mature": 392       # Tons of carbon per hectare
-    }
-    
     forest_age = forest_age.lower()
-    if forest_age not in carbon_rates:
+    if forest_age not in _CARBON_RATES:
         forest_age = "mature"  # Default to mature if age is not recognized
     
-    carbon_per_hectare = carbon_rates[forest_age]
-    total_carbon = area * carbon_per_hectare
-    co2_equivalent = total_carbon * 3.67  # Convert carbon to CO2 equivalent
-    
-    # Economic value (using simplified carbon credit value)
-    carbon_credit_value_usd = co2_equivalent * 15  # Assuming $15 per ton of CO2
+    carbon_per_hectare = _CARBON_RATES[forest_age]
+    total_carbon, co2_equivalent, carbon_credit_value_usd = _carbon_math(area, carbon_per_hectare)
     
     return {
         "status": "success",
@@ -245,12 +496,84 @@ def calculate_carbon_storage(area: float, forest_age: str = "mature") -> dict:
             "total_carbon_tons": total_carbon,
             "co2_equivalent_tons": co2_equivalent,
             "potential_carbon_credit_value_usd": carbon_credit_value_usd,
-            "note": "These are estimates based on general studies of Kenyan mangroves. Actual values may vary based on species composition, health, and local conditions."
+            "note": _CARBON_NOTE
+        }
+    }
+
+def calculate_carbon_storage_batch(areas: List[float], forest_ages: List[str]) -> dict:
+    """
+    Estimates carbon storage potential for several mangrove forest areas at once.
+    
+    Args:
+        areas (list): Areas of mangrove forest in hectares.
+        forest_ages (list): Age classification for each area (young, middle-aged, mature).
+        
+    Returns:
+        dict: Per-area and combined carbon storage estimates or error message.
+    """
+    # Basic validation
+    if not areas:
+        return {
+            "status": "error",
+            "error_message": "Please provide at least one area in hectares."
+        }
+    if len(areas) != len(forest_ages):
+        return {
+            "status": "error",
+            "error_message": "Please provide one forest age for each area in hectares."
+        }
+    if any(not isinstance(area, (int, float)) or area <= 0 for area in areas):
+        return {
+            "status": "error",
+            "error_message": "Please provide valid positive numbers for areas in hectares."
+        }
+    
+    # Default to mature if age is not recognized
+    ages = [age.lower() for age in forest_ages]
+    ages = [age if age in _CARBON_RATES else "mature" for age in ages]
+    
+    carbon_per_hectare = np.asarray([_CARBON_RATES[age] for age in ages], dtype=np.float64)
+    total_carbon, co2_equivalent, carbon_credit_value_usd = _get_carbon_batch_kernel()(
+        np.asarray(areas, dtype=np.float64), carbon_per_hectare
+    )
+    
+    sites = [
+        {
+            "area_hectares": area,
+            "forest_age": age,
+            "carbon_per_hectare_tons": _CARBON_RATES[age],
+            "total_carbon_tons": carbon,
+            "co2_equivalent_tons": co2,
+            "potential_carbon_credit_value_usd": usd
+        }
+        for area, age, carbon, co2, usd in zip(
+            areas, ages, total_carbon.tolist(), co2_equivalent.tolist(), carbon_credit_value_usd.tolist()
+        )
+    ]
+    
+    return {
+        "status": "success",
+        "report": {
+            "sites": sites,
+            "total_carbon_tons": float(total_carbon.sum()),
+            "co2_equivalent_tons": float(co2_equivalent.sum()),
+            "potential_carbon_credit_value_usd": float(carbon_credit_value_usd.sum()),
+            "note": _CARBON_NOTE
         }
     }
 
 # Restoration Planning Function 
 
+# Base cost estimates per hectare (in Kenyan Shillings)
+_BASE_COSTS = {
+    "site_preparation": 25000,
+    "seedling_production": 40000,
+    "planting": 35000,
+    "monitoring_first_year": 20000,
+    "community_engagement": 15000
+}
+_BASE_COSTS_TOTAL = sum(_BASE_COSTS.values())
+
 def plan_restoration(area_hectares: float, location: Optional[str] = None) -> dict:
     """
     Provides a restoration plan for a mangrove area.
@@ -268,43 +591,38 @@ def plan_restoration(area_hectares: float, location: Optional[str] = None) -> di
             "error_message": "Please provide a valid positive number for area in hectares."
         }
     
-    # Base cost estimates per hectare (in Kenyan Shillings)
-    base_costs = {
-        "site_preparation": 25000,
-        "seedling_production": 40000,
-        "planting": 35000,
-        "monitoring_first_year": 20000,
-        "community_engagement": 15000
-    }
-    
     # Calculate basic costs
-    total_cost = sum(base_costs.values()) * area_hectares
+    total_cost = _BASE_COSTS_TOTAL * area_hectares
     seedlings_needed = int(area_hectares * 2000)  # Assuming 2000 seedlings per hectare
     
     # Default species recommendations
     recommended_species = ["Rhizophora mucronata", "Avicennia marina", "Sonneratia alba"]
     timeline_months = 24
     special_considerations = []
+    canonical_location = "Generic plan"
     
     # Customize based on location if provided
     if location:
         location_lower = location.lower()
-        if location_lower in KENYA_COASTAL_REGIONS:
-            info = KENYA_COASTAL_REGIONS[location_lower]
+        if location_lower not in KENYA_COASTAL_REGIONS:
+            canonical_location = location.title()
+        else:
+            canonical_location = _REGION_TITLE[location_lower]
+            threats = _REGION_THREAT_SETS[location_lower]
             
             # Recommend local dominant species
-            recommended_species = [s.title() for s in info["dominant_species"]]
+            recommended_species = list(_REGION_RECOMMENDED_SPECIES[location_lower])
             
             # Add location-specific considerations
-            if "Urban expansion" in info["threats"] or "Pollution" in info["threats"]:
+            if "Urban expansion" in threats or "Pollution" in threats:
                 special_considerations.append("Community waste management education essential")
                 total_cost += 10000 * area_hectares  # Additional cost for pollution mitigation
             
-            if "Tourism development" in info["threats"]:
+            if "Tourism development" in threats:
                 special_considerations.append("Ecotourism integration recommended")
                 timeline_months = 30  # Longer timeline for tourism integration
             
-            if "Sedimentation" in info["threats"]:
+            if "Sedimentation" in threats:
                 special_considerations.append("Soil erosion control measures required upland")
                 total_cost += 15000 * area_hectares  # Additional cost for erosion control
     
@@ -315,7 +633,7 @@ def plan_restoration(area_hectares: float, location: Optional[str] = None) -> di
         "status": "success",
         "report": {
             "area_hectares": area_hectares,
-            "location": location.title() if location else "Generic plan",
+            "location": canonical_location,
             "recommended_species": recommended_species,
             "seedlings_needed": seedlings_needed,
             "estimated_timeline_months": timeline_months,
@@ -333,6 +651,30 @@ def plan_restoration(area_hectares: float, location: Optional[str] = None) -> di
         }
     }
 
+# Fixed framing for general questions, sent once as the model's system instruction
+_QA_SYSTEM_INSTRUCTION = """
+As a mangrove conservation expert, answer the user's question.
+
+Focus on providing accurate, educational information about mangroves, their ecosystems,
+conservation efforts, and carbon benefits. Include scientific facts where relevant.
+"""
+
+# Sampling for general Q&A; google.generativeai takes a plain dict here
+_QA_CFG = {
+    "temperature": 0.2,
+    "max_output_tokens": 1024
+}
+
+@functools.lru_cache(maxsize=None)
+def _get_model(name: str) -> "GenerativeModel":
+    """
+    Returns a shared Gemini model instance, built once per model name.
+    """
+    # Imported here so agent startup does not pay for the SDK until the first question
+    from google.generativeai import GenerativeModel
+    
+    return GenerativeModel(model_name=name, system_instruction=_QA_SYSTEM_INSTRUCTION)
+
 def answer_general_question(question: str) -> dict:
     """
     Answers general questions about mangroves, forests, and carbon credits using Gemini.
@@ -344,26 +686,20 @@ def answer_general_question(question: str) -> dict:
         dict: Answer with information from the model
     """
     try:
-        # Initialize the Gemini model
-        model = GenerativeModel(model_name="gemini-2.0-flash")
-        
-        # Create a prompt that frames the context
-        prompt = f"""
-        As a mangrove conservation expert, please answer this question:
-        {question}
-        
-        Focus on providing accurate, educational information about mangroves, their ecosystems, 
-        conservation efforts, and carbon benefits. Include scientific facts where relevant.
-        """
+        # Reuse the cached Gemini model
+        model = _get_model("gemini-2.0-flash")
         
-        # Generate response
-        response = model.generate_content(prompt)
+        # Drain the stream, then read the SDK's joined text; reading .text per
+        # chunk fails on trailing chunks that carry no parts
+        response = model.generate_content(question, generation_config=_QA_CFG, stream=True)
+        response.resolve()
+        answer = response.text
         
         return {
             "status": "success",
             "report": {
                 "question": question,
-                "answer": response.text
+                "answer": answer
             }
         }
     except Exception as e:
@@ -372,6 +708,13 @@ def answer_general_question(question: str) -> dict:
             "error_message": f"Unable to answer general question: {str(e)}"
         }
 
+# Greedy sampling for tool-routing turns, where determinism is wanted anyway
+_TOOL_CFG = types.GenerateContentConfig(
+    temperature=0.0,
+    top_k=1,
+    max_output_tokens=250
+)
+
 # Create the Mangrove Protection System Agent
 root_agent = Agent(
     name="mikoko_guardian",
@@ -394,11 +737,9 @@ root_agent = Agent(
         identify_mangrove_species, 
         get_site_information,
         calculate_carbon_storage,
+        calculate_carbon_storage_batch,
         plan_restoration,
         answer_general_question
     ],
-    generate_content_config = types.GenerateContentConfig(
-        temperature=0.2, # More deterministic output
-        max_output_tokens=250
-    )
+    generate_content_config=_TOOL_CFG
 )
\ No newline at end of file